@@ -1,50 +1,315 @@
-import threading
-from typing import Any, Callable, Optional, Tuple, Union
+from __future__ import annotations
 
-def typecheck(obj: Any, datatype: Union[type, str], *, error_msg: str = "Object {obj} is not assignable to type '{datatype}'") -> None:
+import _thread
+import functools
+import sys
+from typing import TYPE_CHECKING, Any, Callable, Optional, Tuple, Union
+
+# threading and concurrent.futures are imported on first use, so purely synchronous users never load them
+if TYPE_CHECKING:
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+
+# Worker pool shared by every SideEffect instance for asynchronous side effects outside an event loop, created on first use
+_EXECUTOR: Optional[ThreadPoolExecutor] = None
+_EXECUTOR_LOCK = _thread.allocate_lock()
+
+# Seconds an idle serial worker stays parked for the next update before its thread exits
+_WORKER_IDLE_TIMEOUT = 2.0
+
+# Serial workers with a live thread, woken at interpreter exit so parked ones do not delay it
+_WORKERS: set = set()
+_WORKERS_RELEASED = False
+_EXIT_HOOK_REGISTERED = False
+
+def typecheck(obj: Any, datatype: Union[type, str], *, error_msg: Optional[str] = None) -> None:
     """
     Checks if the given object matches the specified datatype.
     
     Parameters:
     - obj: The object to be checked.
     - datatype: The expected type of the object. If "function", checks if the object is callable.
-    - error_msg: Custom error message for the TypeError (default is a formatted string).
+    - error_msg: Custom error message for the TypeError, formatted with {obj} and {datatype} (default is "Object {obj} is not assignable to type '{datatype}'").
     
     Raises:
     - TypeError: If the object does not match the expected datatype.
     """
     if datatype == "function":
-        if not callable(obj):
-            raise TypeError(
-                error_msg.format(obj=obj, datatype="function")
-            )
-        return
-    
+        _check_callable(obj, error_msg)
+    else:
+        _check_type(obj, datatype, error_msg)
+
+def _check_type(obj: Any, datatype: Union[type, Tuple[type, ...]], error_msg: Optional[str] = None) -> None:
+    """
+    Raises a TypeError unless the object is an instance of the datatype.
+    """
     if not isinstance(obj, datatype):
-        raise TypeError(
-            error_msg.format(obj=obj, datatype=datatype)
-        )
+        raise TypeError(_type_error_message(obj, datatype, error_msg))
+
+def _check_callable(obj: Any, error_msg: Optional[str] = None) -> None:
+    """
+    Raises a TypeError unless the object is callable.
+    """
+    if not callable(obj):
+        raise TypeError(_type_error_message(obj, "function", error_msg))
+
+def _type_error_message(obj: Any, datatype: Union[type, str], error_msg: Optional[str]) -> str:
+    """
+    Builds the TypeError message for typecheck. Only called once a check has failed.
+    """
+    if error_msg is None:
+        return f"Object {obj} is not assignable to type '{datatype}'"
+
+    return error_msg.format(obj=obj, datatype=datatype)
+
+def _submit(fn: Callable[..., None], *args: Any) -> None:
+    """
+    Runs fn(*args) on a worker thread: the running event loop's default executor when called from inside one, the shared pool otherwise.
+    
+    Parameters:
+    - fn: The callable to be executed.
+    - args: Positional arguments for fn.
+    """
+    # No event loop can be running if asyncio was never imported, so only look it up when it was
+    asyncio = sys.modules.get("asyncio")
+    if asyncio is not None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            pass
+        else:
+            loop.run_in_executor(None, fn, *args)
+            return
+
+    executor = _EXECUTOR
+    if executor is None:
+        executor = _start_executor()
+
+    try:
+        executor.submit(fn, *args)
+    except RuntimeError:
+        # The pool refuses new work once the interpreter starts shutting down; a plain thread still runs it, as before the pool existed
+        import threading
+
+        threading.Thread(target=fn, args=args).start()
+
+def _start_executor() -> ThreadPoolExecutor:
+    """
+    Creates the shared worker pool on first use and returns it.
+    """
+    global _EXECUTOR
+
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is None:
+            from concurrent.futures import ThreadPoolExecutor
+
+            # The default size, min(32, cpu_count + 4), leaves room for side effects that block on I/O
+            _EXECUTOR = ThreadPoolExecutor(thread_name_prefix="sideeffect")
+
+        return _EXECUTOR
+
+def _run_side_effect(side_effect: Callable[[], None]) -> None:
+    """
+    Executes a side effect off the calling thread, reporting any exception it raises.
+    
+    Parameters:
+    - side_effect: The callable to be executed.
+    """
+    try:
+        side_effect()
+    except BaseException:
+        # Reported the way a plain Thread reports an uncaught exception, so an installed threading.excepthook still sees it
+        import threading
+
+        exc_type, exc_value, exc_traceback = sys.exc_info()
+        try:
+            threading.excepthook(threading.ExceptHookArgs((exc_type, exc_value, exc_traceback, threading.current_thread())))
+        except Exception as error:
+            # A failing hook falls back to sys.excepthook, as it does for a plain Thread
+            error.__suppress_context__ = True
+            del error
+            if sys.stderr is not None:
+                sys.stderr.write("Exception in threading.excepthook:\n")
+                sys.stderr.flush()
+            sys.excepthook(*sys.exc_info())
+
+def _track_worker(worker: _SerialWorker) -> None:
+    """
+    Records a worker whose thread has just started, registering the interpreter exit hook on first use.
+    """
+    global _EXIT_HOOK_REGISTERED, _WORKERS_RELEASED
+
+    if not _EXIT_HOOK_REGISTERED:
+        with _EXECUTOR_LOCK:
+            if not _EXIT_HOOK_REGISTERED:
+                import threading
+
+                # Runs before interpreter exit joins non-daemon threads, like the hook of the shared pool
+                try:
+                    threading._register_atexit(_release_workers)
+                except RuntimeError:
+                    # Already shutting down, so no worker should park
+                    _WORKERS_RELEASED = True
+                _EXIT_HOOK_REGISTERED = True
+
+    _WORKERS.add(worker)
+
+def _release_workers() -> None:
+    """
+    Wakes every parked worker at interpreter exit so that its thread exits instead of waiting out the idle timeout.
+    """
+    global _WORKERS_RELEASED
+
+    _WORKERS_RELEASED = True
+    for worker in list(_WORKERS):
+        with worker.cv:
+            worker.cv.notify_all()
+
+class _SerialWorker():
+    """
+    Runs one instance's side effect on a thread of its own, one run at a time.
+    
+    Dependent instances use it so that waiting for a side effect never blocks a thread of the shared pool, and coalescing instances use it to debounce updates.
+    
+    Attributes:
+    - cv: The condition variable guarding the worker; dependent setState calls hold it while waiting and updating the state.
+    - dependent: A boolean indicating whether setState waits for the previous side effect before changing the state.
+    - _side_effect: The callable to be executed.
+    - _interval: The debounce window in seconds (0 runs every scheduled update).
+    - _pending: A boolean flag indicating that an update is waiting to be run.
+    - _running: The ident of the worker thread while it executes the side effect (None otherwise).
+    - _thread: The worker thread, started on demand and exiting after _WORKER_IDLE_TIMEOUT seconds without updates (None otherwise).
+    """
+    __slots__ = ("cv", "dependent", "_side_effect", "_interval", "_pending", "_running", "_thread")
+
+    def __init__(self, side_effect: Callable[[], None], *, dependent: bool, interval: float) -> None:
+        import threading
+
+        self.cv = threading.Condition()
+        self.dependent = dependent
+        self._side_effect = side_effect
+        self._interval = interval
+        self._pending = False
+        self._running: Optional[int] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def wait_idle(self) -> None:
+        """
+        Blocks until the previously scheduled side effect has finished. Must be called with cv held.
+        
+        Raises:
+        - RuntimeError: If called from inside the side effect itself, which would otherwise wait forever.
+        """
+        if self._running == _thread.get_ident():
+            raise RuntimeError("cannot wait for a dependent side effect from inside that side effect")
+
+        # Without a debounce window every update runs, so one scheduled but not yet started counts as in progress
+        while self._running is not None or (self._pending and not self._interval):
+            self.cv.wait()
+
+    def schedule(self) -> None:
+        """
+        Flags an update and wakes the worker, starting it if none is running.
+        """
+        with self.cv:
+            self._pending = True
+
+            if self._thread is None:
+                import threading
+
+                # Not a daemon: interpreter exit waits for pending updates, like the shared pool and plain threads do
+                thread = threading.Thread(target=self._run, name="sideeffect-worker")
+                try:
+                    thread.start()
+                except BaseException:
+                    # Nothing will run the update, so waiting dependent updates must not count it as in progress
+                    self._pending = False
+                    raise
+
+                # Holding cv keeps the new thread from reading _thread before it is set
+                self._thread = thread
+                _track_worker(self)
+
+            self.cv.notify_all()
+
+    def _run(self) -> None:
+        """
+        Executes the side effect for flagged updates, once per debounce window when coalescing, until none arrives within the idle timeout.
+        """
+        # Reading these once keeps per-run work on the worker's own references
+        cv = self.cv
+        interval = self._interval
+        side_effect = self._side_effect
+
+        with cv:
+            try:
+                while True:
+                    self._pending = False
+
+                    # Every update arriving within the window restarts it
+                    while interval:
+                        cv.wait(interval)
+                        if not self._pending: break
+                        self._pending = False
+
+                    self._running = _thread.get_ident()
+                    cv.release()
+                    try:
+                        _run_side_effect(side_effect)
+                    finally:
+                        cv.acquire()
+                        self._running = None
+                        cv.notify_all()
+
+                    # Parking so that an instance updated at a steady pace reuses its thread
+                    if not self._pending and not _WORKERS_RELEASED:
+                        cv.wait(_WORKER_IDLE_TIMEOUT)
+
+                    # Exiting when still idle so no thread lingers for an instance that stopped updating
+                    if not self._pending: return
+            finally:
+                # Reset however the loop ends, so the next update starts a new thread instead of waiting on a dead one
+                self._thread = None
+                self._running = None
+                self._pending = False
+                _WORKERS.discard(self)
+                cv.notify_all()
 
 class SideEffect():
     """
     A class to manage a state with an optional side effect that can be executed either synchronously or asynchronously when the state is changed.
     
     Attributes:
-    - _state: The current state.
+    - state: The current state. Read it directly; assign it through setState so the side effect runs.
+      setState publishes a new value with a single attribute store, so a concurrent reader sees either the old or the new object, with or without the GIL.
     - _side_effect: A callable to be executed as a side effect.
     - _asynchronous: A boolean indicating whether the side effect should be executed asynchronously.
-    - _dependent: A boolean indicating whether the side effect is dependent on the state.
     - _side_effect_paused: A boolean flag indicating if the side effect is paused.
-    - _side_effect_thread: The thread executing the side effect, if asynchronous.
+    - _worker: The serial worker executing asynchronous side effects, if dependent or coalescing (None otherwise).
+    - _dispatch_async: The callable used to dispatch an asynchronous side effect; it never references the instance itself.
+    - _equality: A callable deciding whether a new value equals the current state, in which case setState does nothing (None always updates).
+    - _set_state: The plain function from _IMPLS that setState calls for the instance's flags.
     
     Methods:
-    - __init__(self, default=0, side_effect=lambda: None, *, asynchronous=True, dependent=False): Initializes the SideEffect instance.
-    - state(self): Property to get the current state.
+    - __init__(self, default=0, side_effect=lambda: None, *, asynchronous=True, dependent=False, coalesce_ms=0, equality=None): Initializes the SideEffect instance.
     - setState(self, value, *, asynchronous: bool=None, cancel_side_effect: bool=False): Sets the state and executes the side effect.
     - disable_side_effect(self): Disables the execution of the side effect.
     - enable_side_effect(self): Enables the execution of the side effect.
     """
-    def __init__(self, default: Any = 0, side_effect: Callable[[], None] = lambda: None, *, asynchronous: bool = True, dependent: bool = False) -> None:
+    # Fixed attribute storage instead of a per-instance __dict__
+    __slots__ = (
+        "state",
+        "_side_effect",
+        "_asynchronous",
+        "_side_effect_paused",
+        "_worker",
+        "_dispatch_async",
+        "_equality",
+        "_set_state",
+        "__weakref__",
+    )
+
+    def __init__(self, default: Any = 0, side_effect: Callable[[], None] = lambda: None, *, asynchronous: bool = True, dependent: bool = False, coalesce_ms: float = 0, equality: Optional[Callable[[Any, Any], bool]] = None) -> None:
         """
         Initializes the SideEffect instance.
         
@@ -53,27 +318,45 @@ class SideEffect():
         - side_effect: A callable to be executed as a side effect (default is a no-op lambda).
         - asynchronous: If True, the side effect is executed asynchronously (default is True).
         - dependent: If True, the side effect is dependent on the state (default is False).
+        - coalesce_ms: If non-zero, asynchronous side effects are debounced: a burst of setState calls fires the side effect once, coalesce_ms milliseconds after the last call (default is 0).
+        - equality: If provided, called as equality(current_state, value); when it returns True, setState leaves the state alone and skips the side effect (default is None, always update).
+        
+        Raises:
+        - TypeError: If an argument has the wrong type (not checked under python -O).
+        - ValueError: If coalesce_ms is negative, NaN or beyond the longest wait threading supports.
         """
-        self._state = default
+        self.state = default
+
+        # Checking the types for the inputs (compiled away under python -O)
+        if __debug__:
+            _check_callable(side_effect)
+            _check_type(asynchronous, bool)
+            _check_type(dependent, bool)
+            _check_type(coalesce_ms, (int, float))
+            if isinstance(coalesce_ms, bool):
+                raise TypeError(_type_error_message(coalesce_ms, "int or float", None))
+            if equality is not None: _check_callable(equality)
 
-        # Checking the types for the inputs
-        typecheck(side_effect, "function")
-        typecheck(asynchronous, bool)
-        typecheck(dependent, bool)
+        # A negative or NaN window would make cv.wait return at once and silently disable coalescing, and one beyond TIMEOUT_MAX (or infinite) would make it raise OverflowError on the worker
+        if not 0 <= coalesce_ms <= _thread.TIMEOUT_MAX * 1000:
+            raise ValueError(f"coalesce_ms must be a finite non-negative number of milliseconds no greater than {_thread.TIMEOUT_MAX * 1000}, got {coalesce_ms}")
         
         self._side_effect = side_effect
         self._asynchronous = asynchronous
-        self._dependent = dependent
         self._side_effect_paused = False
 
-        self._side_effect_thread: Optional[threading.Thread] = None
+        self._worker: Optional[_SerialWorker] = None
+        if dependent or coalesce_ms:
+            self._worker = _SerialWorker(side_effect, dependent=dependent, interval=coalesce_ms / 1000)
+            self._dispatch_async = self._worker.schedule
+        else:
+            # A C-level partial: dispatching enters no method frame before _submit
+            self._dispatch_async = functools.partial(_submit, _run_side_effect, side_effect)
 
-    @property
-    def state(self) -> Any:
-        """
-        Returns the current state.
-        """
-        return self._state
+        self._equality = equality
+
+        # Picking the implementation for the flags once; a plain function, so the instance holds no bound method of itself
+        self._set_state = self._IMPLS[(asynchronous, dependent)]
 
     def setState(self, value: Any, *, asynchronous: Optional[bool] = None, cancel_side_effect: bool=False) -> None:
         """
@@ -85,27 +368,121 @@ class SideEffect():
         - cancel_side_effect: If True, cancels the execution of the side effect.
         
         Raises:
-        - TypeError: If the asynchronous or cancel_side_effect parameter is not a boolean.
+        - TypeError: If the asynchronous or cancel_side_effect parameter is not a boolean (not checked under python -O).
+        - RuntimeError: If called on a dependent instance from inside its own asynchronously running side effect, which would otherwise wait forever.
         """
-        # Checking the types for the inputs
-        if asynchronous is not None: typecheck(asynchronous, bool)
-        typecheck(cancel_side_effect, bool)
-        
-        if asynchronous is None: asynchronous = self._asynchronous
+        # The equality check runs in the implementations, under the worker lock for dependent instances so it never sees a superseded state
+        if asynchronous is None and cancel_side_effect is False:
+            return self._set_state(self, value)
+
+        self._set_state_override(value, asynchronous=asynchronous, cancel_side_effect=cancel_side_effect)
+
+    def _set_async(self, value: Any) -> None:
+        """
+        Sets the state and dispatches the side effect asynchronously. Used by setState for asynchronous, independent instances.
+        """
+        equality = self._equality
+        if equality is not None and equality(self.state, value): return
 
-        if self._side_effect_thread and self._dependent:
-            self._side_effect_thread.join()
-            self._side_effect_thread = None
+        # One STORE_ATTR publishes the value; nothing else is written before the side effect is dispatched
+        self.state = value
 
-        self._state = value
+        if self._side_effect_paused: return
+
+        self._dispatch_async()
+
+    def _set_async_dependent(self, value: Any) -> None:
+        """
+        Waits for the running side effect, then sets the state and dispatches the side effect asynchronously. Used by setState for asynchronous, dependent instances.
+        """
+        worker = self._worker
+        with worker.cv:
+            worker.wait_idle()
+
+            equality = self._equality
+            if equality is not None and equality(self.state, value): return
+
+            self.state = value
+
+            if self._side_effect_paused: return
+
+            # Scheduling under the lock so that the next dependent update waits for this one
+            worker.schedule()
+
+    def _set_sync(self, value: Any) -> None:
+        """
+        Sets the state and executes the side effect on the calling thread. Used by setState for synchronous, independent instances.
+        """
+        equality = self._equality
+        if equality is not None and equality(self.state, value): return
+
+        self.state = value
+
+        if self._side_effect_paused: return
+
+        self._side_effect()
+
+    def _set_sync_dependent(self, value: Any) -> None:
+        """
+        Waits for any side effect started asynchronously through an override, then sets the state and executes the side effect on the calling thread. Used by setState for synchronous, dependent instances.
+        """
+        worker = self._worker
+        equality = self._equality
+
+        # Only an asynchronous override starts the worker, so without its thread there is nothing to wait for
+        if worker._thread is None:
+            if equality is not None and equality(self.state, value): return
+            self.state = value
+        else:
+            with worker.cv:
+                worker.wait_idle()
+                if equality is not None and equality(self.state, value): return
+                self.state = value
+
+        if self._side_effect_paused: return
+
+        self._side_effect()
+
+    # setState implementations keyed by (asynchronous, dependent), stored per instance as plain functions
+    _IMPLS = {
+        (True, False): _set_async,
+        (True, True): _set_async_dependent,
+        (False, False): _set_sync,
+        (False, True): _set_sync_dependent,
+    }
+
+    def _set_state_override(self, value: Any, *, asynchronous: Optional[bool] = None, cancel_side_effect: bool=False) -> None:
+        """
+        Sets the state and executes the side effect, honouring the per-call options of setState.
+        """
+        # Resolving the override with a single check; the type checks are compiled away under python -O
+        if asynchronous is None:
+            asynchronous = self._asynchronous
+        elif __debug__:
+            _check_type(asynchronous, bool)
+
+        if __debug__:
+            _check_type(cancel_side_effect, bool)
+
+        equality = self._equality
+        worker = self._worker
+        if worker is not None and worker.dependent:
+            with worker.cv:
+                worker.wait_idle()
+                if equality is not None and equality(self.state, value): return
+                self.state = value
+
+                if asynchronous and not (cancel_side_effect or self._side_effect_paused):
+                    worker.schedule()
+                    return
+        else:
+            if equality is not None and equality(self.state, value): return
+            self.state = value
 
         if cancel_side_effect or self._side_effect_paused: return
 
         if asynchronous:
-            side_effect_thread = threading.Thread(target=self._side_effect)
-            self._side_effect_thread = side_effect_thread
-
-            self._side_effect_thread.start()
+            self._dispatch_async()
         else:
             self._side_effect()
 
@@ -121,7 +498,7 @@ class SideEffect():
         """
         self._side_effect_paused = False
 
-def side_effect(default: Any = 0, side_effect: Callable[[], None] = lambda: None, *, asynchronous: bool = True, dependent: bool = False):
+def side_effect(default: Any = 0, side_effect: Callable[[], None] = lambda: None, *, asynchronous: bool = True, dependent: bool = False, coalesce_ms: float = 0, equality: Optional[Callable[[Any, Any], bool]] = None):
     """
     A convenience function to create a SideEffect instance and return accessor functions.
     
@@ -130,15 +507,18 @@ def side_effect(default: Any = 0, side_effect: Callable[[], None] = lambda: None
     - side_effect: A callable to be executed as a side effect (default is a no-op lambda).
     - asynchronous: If True, the side effect is executed asynchronously (default is True).
     - dependent: If True, the side effect is dependent on the state (default is False).
+    - coalesce_ms: If non-zero, a burst of asynchronous side effects fires once, coalesce_ms milliseconds after the last update (default is 0).
+    - equality: If provided, equality(current_state, value) returning True makes setState a no-op (default is None, always update).
     
     Returns:
     - A tuple containing:
-      - A lambda to get the current state.
-      - A lambda to set the state and execute the side effect.
+      - A callable to get the current state.
+      - The instance's setState, to set the state and execute the side effect.
     """
-    _state = SideEffect(default, side_effect, asynchronous=asynchronous, dependent=dependent)
+    _state = SideEffect(default, side_effect, asynchronous=asynchronous, dependent=dependent, coalesce_ms=coalesce_ms, equality=equality)
 
+    # Neither accessor closes over _state, so no closure cell is allocated per call
     return (
-        lambda: _state.state,
+        functools.partial(getattr, _state, "state"),
         _state.setState,
     )
@@ -0,0 +1,345 @@
+import asyncio
+import gc
+import operator
+import os
+import subprocess
+import sys
+import threading
+import time
+import unittest
+import weakref
+from unittest import mock
+
+from sideeffect import SideEffect
+
+def wait_until(predicate, timeout=2.0):
+    """
+    Polls the predicate until it returns True or the timeout passes, returning its last result.
+    """
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.005)
+    return True
+
+class CoalesceTest(unittest.TestCase):
+    def test_burst_fires_once_with_final_state(self):
+        calls = []
+        state = SideEffect(0, lambda: calls.append(state.state), coalesce_ms=30)
+
+        for value in range(1, 50):
+            state.setState(value)
+
+        self.assertTrue(wait_until(lambda: calls))
+        time.sleep(0.1)
+        self.assertEqual(calls, [49])
+
+    def test_worker_restarts_after_idle(self):
+        calls = []
+        state = SideEffect(0, lambda: calls.append(state.state), coalesce_ms=10)
+
+        with mock.patch("sideeffect.main._WORKER_IDLE_TIMEOUT", 0.01):
+            state.setState(1)
+            self.assertTrue(wait_until(lambda: calls == [1]))
+            self.assertTrue(wait_until(lambda: state._worker._thread is None))
+
+        state.setState(2)
+        state.setState(3)
+        self.assertTrue(wait_until(lambda: calls == [1, 3]))
+
+    def test_pending_side_effect_runs_at_interpreter_exit(self):
+        script = (
+            "from sideeffect import SideEffect\n"
+            "SideEffect(0, lambda: print('fired'), coalesce_ms=50).setState(1)\n"
+        )
+        repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        result = subprocess.run([sys.executable, "-c", script], cwd=repo_root, capture_output=True, text=True, timeout=10)
+
+        self.assertEqual(result.stdout.strip(), "fired")
+
+    def test_side_effect_dispatched_during_interpreter_exit_runs(self):
+        script = (
+            "import time\n"
+            "from sideeffect import SideEffect\n"
+            "b = SideEffect(0, lambda: print('b fired'))\n"
+            "def update_b():\n"
+            "    time.sleep(0.2)\n"
+            "    b.setState(1)\n"
+            "SideEffect(0, update_b).setState(1)\n"
+        )
+        repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        result = subprocess.run([sys.executable, "-c", script], cwd=repo_root, capture_output=True, text=True, timeout=10)
+
+        self.assertEqual(result.stdout.strip(), "b fired")
+        self.assertEqual(result.stderr, "")
+
+    def test_sync_dispatch_is_not_coalesced(self):
+        calls = []
+        state = SideEffect(0, lambda: calls.append(state.state), asynchronous=False, coalesce_ms=1000)
+
+        state.setState(1)
+        state.setState(2)
+        self.assertEqual(calls, [1, 2])
+
+    def test_rejects_bool(self):
+        if not __debug__:
+            self.skipTest("type checks are compiled away under python -O")
+
+        with self.assertRaises(TypeError):
+            SideEffect(0, coalesce_ms=True)
+
+    def test_rejects_negative_nan_and_unbounded(self):
+        for coalesce_ms in (-1, float("nan"), float("inf"), 1e300):
+            with self.assertRaises(ValueError):
+                SideEffect(0, coalesce_ms=coalesce_ms)
+
+class ConcurrencyTest(unittest.TestCase):
+    def test_blocking_side_effect_does_not_delay_other_instances(self):
+        release = threading.Event()
+        started = []
+        blocking = SideEffect(0, release.wait)
+        other = SideEffect(0, lambda: started.append(time.monotonic()))
+
+        try:
+            blocking.setState(1)
+            dispatched = time.monotonic()
+            other.setState(1)
+            self.assertTrue(wait_until(lambda: started, timeout=1.0))
+            self.assertLess(started[0] - dispatched, 0.5)
+        finally:
+            release.set()
+
+    def test_event_loop_uses_its_default_executor(self):
+        names = []
+        state = SideEffect(0, lambda: names.append(threading.current_thread().name))
+
+        async def update():
+            state.setState(1)
+
+        asyncio.run(update())
+        state.setState(2)
+        self.assertTrue(wait_until(lambda: len(names) == 2))
+        self.assertTrue(names[0].startswith("asyncio"), names[0])
+        self.assertTrue(names[1].startswith("sideeffect"), names[1])
+
+class DependentTest(unittest.TestCase):
+    def test_waits_for_previous_side_effect(self):
+        calls = []
+        def record():
+            value = state.state
+            time.sleep(0.02)
+            calls.append((value, state.state))
+        state = SideEffect(0, record, dependent=True)
+
+        for value in range(1, 4):
+            state.setState(value)
+
+        self.assertTrue(wait_until(lambda: len(calls) == 3))
+        self.assertEqual(calls, [(1, 1), (2, 2), (3, 3)])
+
+    def test_nested_dependent_updates_do_not_deadlock(self):
+        done = []
+        inner = SideEffect(0, lambda: done.append("inner"), dependent=True)
+        def update_inner():
+            inner.setState(1)
+            inner.setState(2)
+            done.append("outer")
+        outer = SideEffect(0, update_inner)
+
+        outer.setState(1)
+        self.assertTrue(wait_until(lambda: len(done) == 3))
+        self.assertEqual(sorted(done), ["inner", "inner", "outer"])
+
+    def test_reentrant_update_raises(self):
+        errors = []
+        def update_self():
+            try:
+                state.setState(state.state + 1)
+            except RuntimeError as error:
+                errors.append(error)
+        state = SideEffect(0, update_self, dependent=True)
+
+        state.setState(1)
+        self.assertTrue(wait_until(lambda: errors))
+        self.assertEqual(state.state, 1)
+
+    def test_spaced_updates_reuse_the_worker_thread(self):
+        threads = []
+        state = SideEffect(0, lambda: threads.append(threading.current_thread()), dependent=True)
+
+        for value in range(1, 21):
+            state.setState(value)
+            time.sleep(0.005)
+
+        self.assertTrue(wait_until(lambda: len(threads) == 20))
+        self.assertEqual(len(set(threads)), 1)
+
+    def test_parked_worker_does_not_delay_interpreter_exit(self):
+        script = (
+            "from sideeffect import SideEffect\n"
+            "SideEffect(0, lambda: print('fired'), dependent=True).setState(1)\n"
+        )
+        repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        started = time.monotonic()
+        result = subprocess.run([sys.executable, "-c", script], cwd=repo_root, capture_output=True, text=True, timeout=10)
+
+        self.assertEqual(result.stdout.strip(), "fired")
+        self.assertLess(time.monotonic() - started, 1.5)
+
+    def test_recovers_when_the_worker_cannot_start(self):
+        calls = []
+        state = SideEffect(0, lambda: calls.append(state.state), dependent=True)
+
+        with mock.patch.object(threading.Thread, "start", side_effect=RuntimeError("can't start new thread")):
+            with self.assertRaises(RuntimeError):
+                state.setState(1)
+
+        state.setState(2)
+        self.assertTrue(wait_until(lambda: calls == [2]))
+
+class SetStateTest(unittest.TestCase):
+    def test_subclass_override_is_called(self):
+        calls = []
+        class Logged(SideEffect):
+            def setState(self, value, **options):
+                calls.append(value)
+                super().setState(value, **options)
+        state = Logged(0, asynchronous=False)
+
+        state.setState(1)
+        state.setState(2, cancel_side_effect=True)
+        self.assertEqual(calls, [1, 2])
+        self.assertEqual(state.state, 2)
+
+    def test_instances_are_freed_without_the_cycle_collector(self):
+        configurations = [
+            {},
+            {"asynchronous": False},
+            {"dependent": True},
+            {"coalesce_ms": 10},
+            {"equality": operator.eq},
+        ]
+        gc.disable()
+        try:
+            for options in configurations:
+                with self.subTest(**options):
+                    state = SideEffect(0, **options)
+                    reference = weakref.ref(state)
+                    del state
+                    self.assertIsNone(reference())
+        finally:
+            gc.enable()
+
+class ExceptHookTest(unittest.TestCase):
+    def setUp(self):
+        self.reported = []
+        self.original_excepthook = threading.excepthook
+        threading.excepthook = self.reported.append
+
+    def tearDown(self):
+        threading.excepthook = self.original_excepthook
+
+    def test_asynchronous_exceptions_reach_threading_excepthook(self):
+        def fail():
+            raise ValueError("boom")
+        configurations = [{}, {"dependent": True}, {"coalesce_ms": 5}]
+
+        for options in configurations:
+            with self.subTest(**options):
+                self.reported.clear()
+                state = SideEffect(0, fail, **options)
+
+                state.setState(1)
+                self.assertTrue(wait_until(lambda: self.reported))
+                self.assertIs(self.reported[0].exc_type, ValueError)
+                self.assertIsNot(self.reported[0].thread, threading.main_thread())
+
+    def test_later_side_effects_still_run(self):
+        calls = []
+        def fail_once():
+            if state.state == 1:
+                raise ValueError("boom")
+            calls.append(state.state)
+        state = SideEffect(0, fail_once, dependent=True)
+
+        state.setState(1)
+        state.setState(2)
+        self.assertTrue(wait_until(lambda: calls == [2]))
+        self.assertEqual(len(self.reported), 1)
+
+    def test_failing_hook_falls_back_to_sys_excepthook(self):
+        def failing_hook(args):
+            raise RuntimeError("hook failed")
+        fallback = []
+        def fail():
+            raise ValueError("boom")
+        threading.excepthook = failing_hook
+
+        with mock.patch.object(sys, "excepthook", lambda *exc_info: fallback.append(exc_info[0])), mock.patch.object(sys, "stderr", None):
+            state = SideEffect(0, fail, dependent=True)
+            state.setState(1)
+            self.assertTrue(wait_until(lambda: fallback))
+
+        self.assertEqual(fallback, [RuntimeError])
+
+class EqualityTest(unittest.TestCase):
+    def test_equal_value_skips_write_and_side_effect(self):
+        calls = []
+        old, new = [1], [1]
+        state = SideEffect(old, lambda: calls.append(state.state), asynchronous=False, equality=operator.eq)
+
+        state.setState(new)
+        self.assertIs(state.state, old)
+        self.assertEqual(calls, [])
+
+        state.setState([2])
+        self.assertEqual(calls, [[2]])
+
+    def test_equal_value_skips_asynchronous_side_effect(self):
+        calls = []
+        state = SideEffect(0, lambda: calls.append(state.state), equality=operator.eq)
+
+        state.setState(0)
+        state.setState(0, asynchronous=False)
+        state.setState(1)
+        self.assertTrue(wait_until(lambda: calls == [1]))
+        time.sleep(0.05)
+        self.assertEqual(calls, [1])
+
+    def test_identity_equality_fires_for_equal_copies(self):
+        calls = []
+        state = SideEffect([], lambda: calls.append(state.state), asynchronous=False, equality=operator.is_)
+
+        state.setState(state.state)
+        state.setState([])
+        self.assertEqual(len(calls), 1)
+
+    def test_dependent_check_sees_the_previous_update(self):
+        calls = []
+        def record():
+            calls.append(state.state)
+            time.sleep(0.05)
+        state = SideEffect(0, record, dependent=True, equality=operator.eq)
+
+        state.setState(1)
+        updaters = [threading.Thread(target=state.setState, args=(2,)) for _ in range(2)]
+        for updater in updaters:
+            updater.start()
+        for updater in updaters:
+            updater.join()
+
+        self.assertTrue(wait_until(lambda: len(calls) == 2))
+        time.sleep(0.1)
+        self.assertEqual(calls, [1, 2])
+
+    def test_default_always_fires(self):
+        calls = []
+        state = SideEffect(0, lambda: calls.append(state.state), asynchronous=False)
+
+        state.setState(0)
+        state.setState(0)
+        self.assertEqual(calls, [0, 0])
+
+if __name__ == "__main__":
+    unittest.main()